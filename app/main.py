@@ -2,8 +2,16 @@
 
 import streamlit as st
 import pandas as pd
-from utils import load_all_countries_data, create_comparison_boxplot, create_ghi_ranking_table, load_country_data, create_seaborn_boxplot
+from utils import load_all_countries_data, comparison_boxplot_json, create_ghi_ranking_table, load_country_data, create_seaborn_boxplot, create_histogram, COUNTRY_CATEGORIES
 import plotly.express as px
+import plotly.io as pio
+
+# Optional: server-side LTTB downsampling so the browser only ever renders
+# a couple of thousand points of the minute-level time series.
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:
+    FigureResampler = None
 
 # Page Configuration (set this as the first Streamlit command)
 st.set_page_config(
@@ -20,20 +28,78 @@ df_all_countries = load_all_countries_data()
 # --- Sidebar ---
 st.sidebar.title("🌍 MoonLight Energy Solutions")
 st.sidebar.markdown("## Solar Investment Analysis")
-
-page = st.sidebar.radio(
-    "Navigate",
-    ("Cross-Country Comparison", "Individual Country EDA", "About")
-)
 st.sidebar.markdown("---")
 st.sidebar.info(
     "This dashboard presents an analysis of solar irradiance and environmental data "
     "to support strategic solar investments."
 )
 
+# Shared st.plotly_chart options: drop the logo and unused modebar buttons to
+# cut client-side event wiring; passed with theme=None so Streamlit skips
+# re-theming (re-serializing) every figure.
+PLOTLY_CONFIG = {
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ['lasso2d', 'select2d', 'autoScale2d'],
+    'staticPlot': False,
+    'responsive': True,
+}
+
+
+@st.fragment
+def render_boxplot_comparison(df_all):
+    """Metric selectbox + comparison boxplot, isolated as a fragment.
+
+    Changing the metric reruns only this block instead of the whole
+    script (data-load cache lookups, sidebar, ranking table, ...).
+    """
+    metrics_available = ['GHI', 'DNI', 'DHI', 'Tamb', 'TModA', 'TModB', 'RH', 'WS']
+    # Filter for metrics actually present in the loaded data
+    metrics_present = [m for m in metrics_available if m in df_all.columns]
+
+    if not metrics_present:
+        st.info("No common metrics found in the loaded datasets for boxplot comparison.")
+        return
+
+    selected_metric_boxplot = st.selectbox(
+        "Select Metric for Boxplot:",
+        options=metrics_present,
+        index=metrics_present.index('GHI') if 'GHI' in metrics_present else 0, # Default to GHI
+        help="Choose a metric to see its distribution across countries."
+    )
+
+    # --- Boxplot Display ---
+    if selected_metric_boxplot:
+        # Using Plotly for interactive plots; the cached JSON skips
+        # both figure construction and serialization on reselection
+        boxplot_json = comparison_boxplot_json(
+            df_all,
+            selected_metric_boxplot,
+            f"{selected_metric_boxplot} Distribution by Country"
+        )
+        if boxplot_json:
+            st.plotly_chart(pio.from_json(boxplot_json), use_container_width=True,
+                            theme=None, config=PLOTLY_CONFIG)
+        else:
+            st.info(f"Could not generate boxplot for {selected_metric_boxplot}.")
+
+        # # Alternative: Using Seaborn/Matplotlib (static image)
+        # st.markdown("### Static Boxplot (Seaborn/Matplotlib)")
+        # static_boxplot_fig = create_seaborn_boxplot(
+        #     df_all,
+        #     selected_metric_boxplot,
+        #     f"{selected_metric_boxplot} Distribution by Country (Static)"
+        # )
+        # st.pyplot(static_boxplot_fig)
+
+
 # --- Main Page Content ---
+# Tabs instead of a sidebar radio: switching tabs happens in the browser
+# without re-running the whole script on the server.
+tab_comparison, tab_eda, tab_about = st.tabs(
+    ["📊 Cross-Country Comparison", "🔍 Individual Country EDA", "ℹ️ About"]
+)
 
-if page == "Cross-Country Comparison":
+with tab_comparison:
     st.header("📊 Cross-Country Solar Resource Comparison")
     st.markdown("Comparing key solar metrics across Benin, Sierra Leone, and Togo.")
 
@@ -42,65 +108,40 @@ if page == "Cross-Country Comparison":
     else:
         # --- Metric Selection for Boxplot ---
         st.subheader("Metric Distribution Comparison")
-        metrics_available = ['GHI', 'DNI', 'DHI', 'Tamb', 'TModA', 'TModB', 'RH', 'WS']
-        # Filter for metrics actually present in the loaded data
-        metrics_present = [m for m in metrics_available if m in df_all_countries.columns]
-
-        if not metrics_present:
-            st.info("No common metrics found in the loaded datasets for boxplot comparison.")
-        else:
-            selected_metric_boxplot = st.selectbox(
-                "Select Metric for Boxplot:",
-                options=metrics_present,
-                index=metrics_present.index('GHI') if 'GHI' in metrics_present else 0, # Default to GHI
-                help="Choose a metric to see its distribution across countries."
-            )
-
-            # --- Boxplot Display ---
-            if selected_metric_boxplot:
-                # Using Plotly for interactive plots
-                boxplot_fig = create_comparison_boxplot(
-                    df_all_countries,
-                    selected_metric_boxplot,
-                    f"{selected_metric_boxplot} Distribution by Country"
-                )
-                if boxplot_fig:
-                    st.plotly_chart(boxplot_fig, use_container_width=True)
-                else:
-                    st.info(f"Could not generate boxplot for {selected_metric_boxplot}.")
-            
-                # # Alternative: Using Seaborn/Matplotlib (static image)
-                # st.markdown("### Static Boxplot (Seaborn/Matplotlib)")
-                # static_boxplot_fig = create_seaborn_boxplot(
-                #     df_all_countries,
-                #     selected_metric_boxplot,
-                #     f"{selected_metric_boxplot} Distribution by Country (Static)"
-                # )
-                # st.pyplot(static_boxplot_fig)
-
+        render_boxplot_comparison(df_all_countries)
 
         st.markdown("---")
         # --- Top Regions Table (GHI Ranking) ---
         st.subheader("☀️ Country Ranking by Average Daytime GHI")
         st.markdown("Countries ranked by their average Global Horizontal Irradiance (GHI) during daytime (GHI > 50 W/m²).")
-        
+
         ranking_table_df = create_ghi_ranking_table(df_all_countries)
-        if not ranking_table_df.empty:
-            # Nicer display for the table
+        ghi_col = 'Average Daytime GHI (W/m²)'
+        if not ranking_table_df.empty and ghi_col in ranking_table_df.columns:
+            # Nicer display for the table. column_config formats and highlights
+            # natively, without the per-cell Python HTML a pandas Styler builds.
             st.dataframe(
-                ranking_table_df.style.format({'Average Daytime GHI (W/m²)': "{:.2f}"})
-                                 .highlight_max(subset=['Average Daytime GHI (W/m²)'], color='lightgreen')
-                                 .set_properties(**{'font-size': '10pt', 'width': '200px'}),
-                use_container_width=True
+                ranking_table_df,
+                use_container_width=True,
+                column_config={
+                    ghi_col: st.column_config.ProgressColumn(
+                        ghi_col,
+                        format="%.2f",
+                        min_value=0.0,
+                        max_value=float(ranking_table_df[ghi_col].max()),
+                    )
+                },
             )
+        elif not ranking_table_df.empty:
+            st.dataframe(ranking_table_df, use_container_width=True)
         else:
             st.info("Could not generate GHI ranking table. Data might be missing or insufficient.")
 
 
-elif page == "Individual Country EDA":
+with tab_eda:
     st.header("🔍 Individual Country EDA Insights")
-    
-    country_options = ["Benin", "Sierra Leone", "Togo"]
+
+    country_options = COUNTRY_CATEGORIES # same list backing the Country categorical
     selected_country_eda = st.selectbox(
         "Select Country to Explore:",
         options=country_options,
@@ -117,13 +158,33 @@ elif page == "Individual Country EDA":
         else:
             st.subheader("Data Overview")
             st.dataframe(df_country.head())
-            
+
             st.subheader("Time Series of GHI")
             if 'GHI' in df_country.columns:
-                # Simple line chart using Plotly Express
-                fig_ts_ghi = px.line(df_country.reset_index(), x='Timestamp', y='GHI', # reset_index if Timestamp is index
-                                     title=f'GHI Time Series for {selected_country_eda}')
-                st.plotly_chart(fig_ts_ghi, use_container_width=True)
+                # Resampling to coarser granularity before plotting cuts the
+                # number of points serialized to the browser (60x for hourly).
+                resample_freq = st.select_slider(
+                    "Time series granularity:",
+                    options=['1min', '15min', '1h', '1D'],
+                    value='1h',
+                    help="Coarser granularity plots fewer points and renders faster."
+                )
+                if resample_freq == '1min':
+                    ts_ghi = df_country.reset_index()[['Timestamp', 'GHI']] # raw minute-level data
+                else:
+                    ts_ghi = df_country['GHI'].resample(resample_freq).mean().reset_index()
+
+                # Simple line chart using Plotly Express. WebGL renders the many
+                # time-series points on the GPU instead of as SVG DOM nodes.
+                fig_ts_ghi = px.line(ts_ghi, x='Timestamp', y='GHI',
+                                     title=f'GHI Time Series for {selected_country_eda}',
+                                     render_mode='webgl')
+                if FigureResampler is not None:
+                    # LTTB-downsample server-side: ~2k points reach the browser
+                    # no matter how long the series is.
+                    fig_ts_ghi = FigureResampler(fig_ts_ghi, default_n_shown_samples=2000)
+                st.plotly_chart(fig_ts_ghi, use_container_width=True,
+                                theme=None, config=PLOTLY_CONFIG)
             else:
                 st.info("GHI data not available for selected country.")
 
@@ -131,28 +192,35 @@ elif page == "Individual Country EDA":
             # For example, a histogram of a selected variable, or a wind rose if you implement it in utils
             st.subheader("Distribution of Ambient Temperature (Tamb)")
             if 'Tamb' in df_country.columns:
-                fig_hist_tamb = px.histogram(df_country, x='Tamb', nbins=50,
-                                             title=f'Ambient Temperature Distribution for {selected_country_eda}')
-                st.plotly_chart(fig_hist_tamb, use_container_width=True)
+                # Bins are computed server-side in NumPy; only ~50 bars are
+                # sent to the browser rather than every raw reading.
+                fig_hist_tamb = create_histogram(df_country, 'Tamb',
+                                                 f'Ambient Temperature Distribution for {selected_country_eda}',
+                                                 nbins=50)
+                if fig_hist_tamb:
+                    st.plotly_chart(fig_hist_tamb, use_container_width=True,
+                                    theme=None, config=PLOTLY_CONFIG)
+                else:
+                    st.info(f"Could not generate Tamb histogram for {selected_country_eda}.")
             else:
                 st.info("Tamb data not available for selected country.")
 
 
-elif page == "About":
+with tab_about:
     st.header("ℹ️ About This Dashboard")
     st.markdown("""
     This dashboard was developed as part of the **MoonLight Energy Solutions - Solar Challenge Week 1**.
-    
+
     **Objective:** To analyze solar irradiance and environmental data from Benin, Sierra Leone, and Togo
     to identify key trends and insights, supporting strategic decisions for solar investments.
 
     **Data Source:** Aggregated Solar Radiation Measurement Data.
-    
+
     **Key Features:**
     - **Cross-Country Comparison:** Side-by-side visualization of key solar metrics.
     - **Individual Country EDA:** Basic exploration of data for each selected country.
     - **GHI Ranking:** A simple ranking of countries based on average daytime GHI.
-    
+
     Built with **Streamlit** and **Plotly Express**.
     """)
     st.markdown("---")
@@ -162,4 +230,4 @@ elif page == "About":
 # To run this app:
 # 1. Navigate to your project root in the terminal (where 'app/' folder is)
 # 2. Make sure your virtual environment is activated.
-# 3. Run: streamlit run app/main.py
\ No newline at end of file
+# 3. Run: streamlit run app/main.py
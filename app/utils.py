@@ -1,100 +1,265 @@
 # app/utils.py
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import os
-import plotly.express as px # Using Plotly Express for interactivity
-import seaborn as sns # Can still use seaborn/matplotlib if preferred
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import plotly.graph_objects as go
+
+# Columns the dashboard actually uses; restricting reads to these keeps
+# unused CSV/Parquet columns out of RAM.
+NEEDED_COLS = ['Timestamp', 'GHI', 'DNI', 'DHI', 'Tamb', 'TModA', 'TModB', 'RH', 'WS']
+
+# Fixed category order shared by every Country column, so concatenated frames
+# keep a single categorical dtype instead of falling back to object.
+COUNTRY_CATEGORIES = ["Benin", "Sierra Leone", "Togo"]
+
+# The combined DataFrame is stable within a session, so hashing its shape and
+# columns is enough to key figure caches without scanning the whole frame.
+_DF_HASH_FUNCS = {pd.DataFrame: lambda d: (d.shape, tuple(d.columns))}
+
+# Data paths resolved once at import so cache misses don't repeat the
+# dirname/join/exists dance per call. data/ lives either next to app/
+# (path relative to this file) or under the cwd when run from project root.
+_DATA_DIR_CANDIDATES = (Path(__file__).parent.parent / 'data', Path('data'))
+DATA_DIR = next((p for p in _DATA_DIR_CANDIDATES if p.exists()), _DATA_DIR_CANDIDATES[0])
+
+_BASENAME_MAP = {
+    "Benin": "benin_clean",
+    "Sierra Leone": "sierraleone_clean",
+    "Togo": "togo_clean"
+}
+
+# Prefer the Parquet conversion (scripts/convert_to_parquet.py), fall back to
+# the cleaned CSV if it has not been converted yet.
+FILE_MAP = {
+    country: (DATA_DIR / (basename + '.parquet')
+              if (DATA_DIR / (basename + '.parquet')).exists()
+              else DATA_DIR / (basename + '.csv'))
+    for country, basename in _BASENAME_MAP.items()
+}
+
+# Cache data loading to improve performance. persist="disk" pickles the result
+# under .streamlit/cache so a server restart skips re-parsing the data files.
+@st.cache_data(persist="disk", ttl=None, max_entries=4)
+def _read_country_frame(country_name):
+    """Reads and prepares one country's frame; returns (df, error or None).
+
+    Pure pandas/NumPy with no Streamlit calls, so it is safe to run in
+    worker threads (where st.* elements would be silently dropped) and
+    to cache; both the EDA tab and the combined loader share this cache.
+    """
+    # Paths are resolved once at import into FILE_MAP; no stat calls here
+    file_path_to_load = FILE_MAP.get(country_name)
+    if file_path_to_load is None:
+        return pd.DataFrame(), None # Empty frame if country name is invalid
+
+    if not file_path_to_load.exists():
+        return pd.DataFrame(), f"Could not find a data file for '{country_name}' (expected '{file_path_to_load}')."
+
+    try:
+        if file_path_to_load.suffix == '.parquet':
+            df = pd.read_parquet(file_path_to_load, columns=NEEDED_COLS, engine='pyarrow')
+            df.set_index('Timestamp', inplace=True)
+        else:
+            # The pyarrow engine tokenizes the CSV multi-threaded and
+            # parses timestamps in C, unlike pandas' default C engine
+            df = pd.read_csv(file_path_to_load, engine='pyarrow', parse_dates=['Timestamp'])
+            df.set_index('Timestamp', inplace=True)
+        # Keep only the metrics the dashboard plots and halve their width;
+        # float32 is plenty for irradiance/temperature readings and halves
+        # both RAM and the bytes serialized to Plotly.
+        metric_cols = [c for c in NEEDED_COLS if c != 'Timestamp' and c in df.columns]
+        df = df[metric_cols].astype('float32')
+        # Categorical country column built straight from int8 codes:
+        # 1 byte/row instead of broadcasting a Python string
+        code = COUNTRY_CATEGORIES.index(country_name)
+        df['Country'] = pd.Categorical.from_codes(
+            np.full(len(df), code, dtype=np.int8),
+            categories=COUNTRY_CATEGORIES
+        )
+        return df, None
+    except Exception as e:
+        return pd.DataFrame(), f"Error loading data for {country_name}: {e}"
+
 
-# Cache data loading to improve performance
-@st.cache_data # Use st.cache_data for data, st.cache_resource for non-data like ML models
 def load_country_data(country_name):
-    """Loads the cleaned data for a specific country."""
-    filename_map = {
-        "Benin": "benin_clean.csv",
-        "Sierra Leone": "sierraleone_clean.csv",
-        "Togo": "togo_clean.csv"
-    }
-    filename = filename_map.get(country_name)
-    if not filename:
-        return pd.DataFrame() # Return empty DataFrame if country name is invalid
-
-    # Try to find the data directory relative to this utils.py file or from project root
-    # This assumes app/ is one level down from the project root where data/ also is.
-    
-    # Path relative to the current file (utils.py inside app/)
-    # So, ../data/filename
-    data_dir_relative_to_app = os.path.join(os.path.dirname(__file__), '..', 'data')
-    file_path_relative = os.path.join(data_dir_relative_to_app, filename)
-
-    # Fallback: Path from project root (if app is run from project root, e.g. streamlit run app/main.py)
-    data_dir_from_root = "data"
-    file_path_from_root = os.path.join(data_dir_from_root, filename)
-
-    file_path_to_load = None
-    if os.path.exists(file_path_relative):
-        file_path_to_load = file_path_relative
-    elif os.path.exists(file_path_from_root):
-        file_path_to_load = file_path_from_root
-        
-    if file_path_to_load:
-        try:
-            df = pd.read_csv(file_path_to_load, index_col='Timestamp', parse_dates=True)
-            df['Country'] = country_name # Add country column for combined plots
-            return df
-        except FileNotFoundError:
-            st.error(f"Error: Cleaned data file '{filename}' not found at '{file_path_to_load}'.")
-            return pd.DataFrame()
-        except Exception as e:
-            st.error(f"Error loading data for {country_name}: {e}")
-            return pd.DataFrame()
-    else:
-        st.error(f"Could not determine path for data file '{filename}'. Checked relative and root paths.")
-        return pd.DataFrame()
-
-
-@st.cache_data
-def load_all_countries_data(country_list=["Benin", "Sierra Leone", "Togo"]):
-    """Loads and combines data for all specified countries."""
+    """Loads the cleaned data for a specific country.
+
+    Prefers the Parquet files produced by scripts/convert_to_parquet.py
+    (columnar binary, already-typed timestamps) and falls back to the
+    cleaned CSVs if they have not been converted yet. A thin wrapper
+    around the cached reader that surfaces any error in the UI.
+    """
+    df, error = _read_country_frame(country_name)
+    if error:
+        st.error(error)
+    return df
+
+
+# cache_resource (not cache_data) returns the combined frame by reference:
+# cache hits skip the per-session pickle round-trip and all sessions share a
+# single copy in RAM. The frame is read-only reference data — consumers must
+# not mutate it. Disk persistence is kept by the per-country caches underneath.
+@st.cache_resource(max_entries=4)
+def load_all_countries_data(country_list=("Benin", "Sierra Leone", "Togo")):
+    """Loads and combines data for all specified countries.
+
+    Returns a shared, read-only DataFrame — do not mutate it. The
+    per-country loads are independent and pandas releases the GIL inside
+    its readers, so running them in threads makes a cold load take the
+    slowest file's time instead of the sum of all three.
+    """
+    # Workers run the pure reader (no st.* calls, which would be dropped
+    # without a ScriptRunContext); errors are reported from the main thread.
+    with ThreadPoolExecutor(max_workers=len(country_list)) as executor:
+        results = list(executor.map(_read_country_frame, country_list))
+
     all_dfs = []
-    for country in country_list:
-        df = load_country_data(country)
+    for df, error in results:
+        if error:
+            st.error(error)
         if not df.empty:
             all_dfs.append(df)
-    
+
     if not all_dfs:
         return pd.DataFrame() # Return empty if no data could be loaded
         
-    return pd.concat(all_dfs, ignore_index=False) # Keep original Timestamp index
+    # The comparison views never use the Timestamp index, so drop it rather
+    # than letting concat build a combined DatetimeIndex.
+    return pd.concat(all_dfs, sort=False, ignore_index=True)
+
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=16)
+def metric_summary_by_country(df_combined, metric):
+    """Computes the boxplot 5-number summary of a metric for each country.
 
+    Works on the frame it is given (so filtered frames summarize the
+    filtered data) and returns {country: (q1, median, q3, lowerfence,
+    upperfence)} using the standard 1.5*IQR fences clipped to the range.
+    """
+    summaries = {}
+    metric_values = df_combined[metric].to_numpy()
+    codes = df_combined['Country'].cat.codes.to_numpy()
+    for code, country in enumerate(COUNTRY_CATEGORIES):
+        values = metric_values[codes == code]
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            continue
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        lowerfence = max(values.min(), q1 - 1.5 * iqr)
+        upperfence = min(values.max(), q3 + 1.5 * iqr)
+        summaries[country] = (q1, median, q3, lowerfence, upperfence)
+    return summaries
 
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=16)
 def create_comparison_boxplot(df_combined, metric, title):
-    """Creates a comparison boxplot using Plotly Express."""
+    """Creates a comparison boxplot from precomputed 5-number summaries.
+
+    go.Box with explicit quartiles/fences sends 5 numbers per country to
+    the browser instead of every individual value.
+    """
     if df_combined.empty or metric not in df_combined.columns:
         return None
-    fig = px.box(df_combined, x='Country', y=metric, color='Country',
-                 title=title, labels={metric: f"{metric} (Units)"}) # Add units later
-    fig.update_layout(title_x=0.5) # Center title
+    summaries = metric_summary_by_country(df_combined, metric)
+    if not summaries:
+        return None
+
+    fig = go.Figure([
+        go.Box(name=country, q1=[q1], median=[median], q3=[q3],
+               lowerfence=[lowerfence], upperfence=[upperfence],
+               boxpoints=False)
+        for country, (q1, median, q3, lowerfence, upperfence) in summaries.items()
+    ])
+    # hovermode=False skips Plotly.js per-point hover event wiring
+    fig.update_layout(title=title, title_x=0.5, showlegend=False, hovermode=False,
+                      xaxis_title='Country', yaxis_title=f"{metric} (Units)") # Add units later
     return fig
 
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=4)
+def daytime_ghi_means(df_combined):
+    """Computes the mean daytime (GHI > 50 W/m²) GHI per country, once.
+
+    A single NumPy pass: np.bincount over the Country categorical codes
+    replaces the boolean-filtered frame plus groupby, so no intermediate
+    DataFrame is materialized from the long combined frame.
+    """
+    ghi = df_combined['GHI'].to_numpy()
+    codes = df_combined['Country'].cat.codes.to_numpy()
+    mask = ghi > 50
+    masked_codes = codes[mask]
+    sums = np.bincount(masked_codes, weights=ghi[mask], minlength=len(COUNTRY_CATEGORIES))
+    counts = np.bincount(masked_codes, minlength=len(COUNTRY_CATEGORIES))
+    rows = [{'Country': country, 'GHI': total / n}
+            for country, total, n in zip(COUNTRY_CATEGORIES, sums, counts) if n > 0]
+    return pd.DataFrame(rows)
+
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=16)
+def comparison_boxplot_json(df_combined, metric, title):
+    """Returns the comparison boxplot as its compiled Plotly JSON string.
+
+    Caching the JSON (rather than the Figure object) also skips the
+    fig.to_json() serialization cost on repeated metric selections.
+    """
+    fig = create_comparison_boxplot(df_combined, metric, title)
+    if fig is None:
+        return None
+    return fig.to_json()
+
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=16)
 def create_ghi_ranking_table(df_combined):
     """Creates a table ranking countries by average GHI."""
     if df_combined.empty or 'GHI' not in df_combined.columns:
         return pd.DataFrame() # Return empty DataFrame
 
-    # Calculate mean GHI only during potential productive hours
-    df_daytime = df_combined[df_combined['GHI'] > 50]
-    if df_daytime.empty:
+    # Per-country means are pre-aggregated and cached; only formatting happens here
+    avg_ghi = daytime_ghi_means(df_combined)
+    if avg_ghi.empty:
         return pd.DataFrame({"Message": ["No daytime GHI data (GHI > 50 W/m^2) available for ranking."]})
 
-    avg_ghi = df_daytime.groupby('Country')['GHI'].mean().sort_values(ascending=False).reset_index()
+    avg_ghi = avg_ghi.sort_values('GHI', ascending=False).reset_index(drop=True)
     avg_ghi.rename(columns={'GHI': 'Average Daytime GHI (W/m²)'}, inplace=True)
     avg_ghi.index = avg_ghi.index + 1 # Start ranking from 1
     return avg_ghi
 
+def create_histogram(df, column, title, nbins=50):
+    """Creates a histogram by binning in NumPy and drawing the bars directly.
+
+    Only the ~nbins bar centres/counts reach the browser, instead of every
+    raw value plus Plotly Express' per-row DataFrame wrangling.
+    """
+    if df.empty or column not in df.columns:
+        return None
+    values = df[column].to_numpy()
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+
+    counts, edges = np.histogram(values, bins=nbins)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_line_width=0
+    ))
+    fig.update_layout(title=title, title_x=0.5, bargap=0,
+                      xaxis_title=column, yaxis_title='Count')
+    return fig
+
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS, max_entries=16)
 def create_seaborn_boxplot(df_combined, metric, title):
     """Creates a comparison boxplot using Seaborn (for static image if needed)."""
+    # Lazy imports: seaborn/matplotlib add ~400ms to cold start and this
+    # static-plot path is normally disabled in main.py.
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     if df_combined.empty or metric not in df_combined.columns:
         fig, ax = plt.subplots()
         ax.text(0.5, 0.5, "Data not available", ha='center', va='center')
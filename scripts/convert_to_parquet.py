@@ -0,0 +1,39 @@
+# scripts/convert_to_parquet.py
+# One-off converter: turns the cleaned per-country CSVs in data/ into Parquet
+# files that the dashboard loads much faster (binary columnar, typed timestamps).
+# Run once after regenerating the cleaned CSVs from the EDA notebooks:
+#   python scripts/convert_to_parquet.py
+
+import os
+
+import pandas as pd
+
+# data/ lives at the project root, one level up from scripts/
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+CSV_FILES = {
+    "Benin": "benin_clean.csv",
+    "Sierra Leone": "sierraleone_clean.csv",
+    "Togo": "togo_clean.csv"
+}
+
+
+def convert_all():
+    """Converts each cleaned country CSV into a Parquet file next to it."""
+    for country, csv_name in CSV_FILES.items():
+        csv_path = os.path.join(DATA_DIR, csv_name)
+        if not os.path.exists(csv_path):
+            print(f"Skipping {country}: '{csv_path}' not found.")
+            continue
+
+        parquet_name = csv_name.replace('.csv', '.parquet')
+        parquet_path = os.path.join(DATA_DIR, parquet_name)
+
+        df = pd.read_csv(csv_path, parse_dates=['Timestamp'])
+        # Keep Timestamp as a regular column so readers can select it like any other
+        df.to_parquet(parquet_path, engine='pyarrow', index=False)
+        print(f"Converted {csv_name} -> {parquet_name} ({len(df)} rows)")
+
+
+if __name__ == "__main__":
+    convert_all()